@@ -20,6 +20,10 @@ from shutil import copyfile
 import warnings
 warnings.filterwarnings('ignore')
 
+# Rust fast tokenizer가 pre-tokenization을 전체 코어로 병렬 처리하도록 설정
+# (DataLoader worker fork 이전에 지정해야 적용됨)
+os.environ['TOKENIZERS_PARALLELISM'] = 'true'
+
 if __name__ == "__main__":
     """---Setting---"""
     # argsparse 이용해서 실험명 가져오기
@@ -45,7 +49,7 @@ if __name__ == "__main__":
 
     """---Train---"""
     # 데이터 로더와 모델 가져오기
-    tokenizer = AutoTokenizer.from_pretrained(CFG['train']['model_name'])
+    tokenizer = AutoTokenizer.from_pretrained(CFG['train']['model_name'], use_fast=True)
     CFG['train']['special_tokens_list'] = utils.get_add_special_tokens()
     tokenizer.add_special_tokens({
         'additional_special_tokens': CFG['train']['special_tokens_list']
@@ -114,7 +118,7 @@ if __name__ == "__main__":
         callbacks.append(early_stopping)
     # fit
     trainer = pl.Trainer(accelerator='gpu',
-                         precision="16-mixed" if CFG['train']['halfprecision'] else 32,
+                         precision=CFG['train'].get('precision', "16-mixed" if CFG['train']['halfprecision'] else 32),
                          accumulate_grad_batches=CFG['train']['gradient_accumulation'],
                          max_epochs=CFG['train']['epoch'],
                          default_root_dir=save_path,
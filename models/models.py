@@ -118,7 +118,7 @@ class Model(pl.LightningModule):
         self.ent_id = tokenizer.convert_tokens_to_ids('[ENT]')
         
         self.loss_func = torch.nn.CrossEntropyLoss(label_smoothing = self.CFG['train']['lossF']['smooth_scale'])
-        self.optim = eval("torch.optim." + self.CFG['train']['optim'])
+        self.optim = getattr(torch.optim, self.CFG['train']['optim'])
         
         # LSTM layer 초기화
         self.types2labelnum = load_types2labelnum() if self.CFG['train']['lossF']['name'] == 'focal_loss' else None
@@ -134,14 +134,24 @@ class Model(pl.LightningModule):
         if self.CFG['select_DC'] is not None and "add_entity_tokens_base" in self.CFG['select_DC'] and self.CFG['train']['type_classify']:
             self.type_classify_init()
 
+        # validation 동안 GPU 위에 모아둘 결과 버퍼 (epoch 끝에 한 번만 CPU로 복사)
+        self._val_buf = {'probs': [], 'preds': [], 'y': []}
+
     def forward(self, input_ids, attention_mask, token_type_ids):
-        outputs = self.LM(
-            input_ids=input_ids,
-            attention_mask=attention_mask,
-            token_type_ids=token_type_ids,
-            output_hidden_states=True
-        )
-        
+        # mixed precision으로 학습 중이면 LM forward를 bf16 autocast로 감싸
+        # matmul이 Tensor Core 경로를 타도록 함 (loss 계산은 fp32로 되돌려서 수행)
+        trainer = getattr(self, '_trainer', None)
+        use_bf16 = torch.cuda.is_available() and trainer is not None \
+            and str(trainer.precision) in ('bf16-mixed', 'bf16', '16-mixed', '16')
+
+        with torch.autocast('cuda', dtype=torch.bfloat16, enabled=use_bf16):
+            outputs = self.LM(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                token_type_ids=token_type_ids,
+                output_hidden_states=True
+            )
+
         if self.CFG['train']['LSTM']['Do']:
             """
             batch 내의 각 sentence에 대해 LSTM을 수행.
@@ -179,9 +189,10 @@ class Model(pl.LightningModule):
             attention_mask=x['attention_mask'],
             token_type_ids=x['token_type_ids']
         )
-        loss = self.loss_func(outputs['logits'], y) if self.CFG['train']['lossF']['name'] != 'focal_loss' else\
-            Adaptive_Threshold_loss(outputs['logits'], y) if self.CFG['train']['lossF']['name'] == 'Adaptive_Threshold_loss' else\
-            focal_loss(outputs['logits'], y, sub_obj_types, self.types2labelnum, self.CFG['train']['lossF']['focal_loss_scale'])
+        logits = outputs['logits'].float()      # 수치 안정성을 위해 loss는 fp32 logits로 계산
+        loss = self.loss_func(logits, y) if self.CFG['train']['lossF']['name'] != 'focal_loss' else\
+            Adaptive_Threshold_loss(logits, y) if self.CFG['train']['lossF']['name'] == 'Adaptive_Threshold_loss' else\
+            focal_loss(logits, y, sub_obj_types, self.types2labelnum, self.CFG['train']['lossF']['focal_loss_scale'])
 
         # multi-task learning: type classify 학습
         if self.CFG['select_DC'] is not None and "add_entity_tokens_base" in self.CFG['select_DC'] and self.CFG['train']['type_classify']:
@@ -190,12 +201,12 @@ class Model(pl.LightningModule):
         
         # R-drop loss 계산
         if self.CFG['train']['lossF']['rdrop']:
-            logit_p = outputs['logits']
+            logit_p = logits
             logit_q = self(
                 input_ids=x['input_ids'],
                 attention_mask=x['attention_mask'],
                 token_type_ids=x['token_type_ids']
-            )['logits']
+            )['logits'].float()
             
             rloss = rdrop_loss(logit_p, logit_q)
             loss += rloss * self.CFG['train']['lossF']['rdrop_alpha']
@@ -212,17 +223,34 @@ class Model(pl.LightningModule):
                 attention_mask=x['attention_mask'],
                 token_type_ids=x['token_type_ids']
             )
-            loss = self.loss_func(outputs['logits'], y)
-            self.log("val_loss", loss)
+            logits = outputs['logits'].float()  # 수치 안정성을 위해 loss는 fp32 logits로 계산
+            loss = self.loss_func(logits, y)
+            self.log("val_loss", loss, on_epoch=True, sync_dist=True)
 
-            metric = metrics.compute_metrics(
-                F.softmax(outputs['logits'], dim=-1), y)
-            self.log('val_micro_f1_Score', metric['micro f1 score'])
-            self.log('val_AUPRC', metric['auprc'])
-            self.log('val_acc', metric['accuracy'])
+            # 매 step마다 .cpu()로 동기화하지 않도록 GPU 위에서 softmax까지만 계산해 모아두기
+            # softmax는 batch당 한 번만 수행하고 preds는 그 결과를 재사용해 argmax
+            probs = F.softmax(logits, dim=-1).detach()
+            self._val_buf['probs'].append(probs)
+            self._val_buf['preds'].append(probs.argmax(dim=-1))
+            self._val_buf['y'].append(y.detach())
 
             return loss
 
+    def on_validation_epoch_end(self):
+        if not self._val_buf['probs']:
+            return
+
+        # 모아둔 결과를 concat해서 한 번만 CPU로 옮긴 뒤 metric 계산
+        probs = torch.cat(self._val_buf['probs']).cpu()
+        preds = torch.cat(self._val_buf['preds']).cpu()
+        y = torch.cat(self._val_buf['y']).cpu()
+        self._val_buf = {'probs': [], 'preds': [], 'y': []}
+
+        metric = metrics.compute_metrics(probs, y, preds=preds)
+        self.log('val_micro_f1_Score', metric['micro f1 score'])
+        self.log('val_AUPRC', metric['auprc'])
+        self.log('val_acc', metric['accuracy'])
+
     def predict_step(self, batch, batch_idx):
         x = batch
         outputs = self(
@@ -230,8 +258,9 @@ class Model(pl.LightningModule):
             attention_mask=x['attention_mask'],
             token_type_ids=x['token_type_ids']
         )
-        probs = F.softmax(outputs['logits'], dim=-1)
-        preds = np.argmax(probs.cpu().numpy(), axis=-1)
+        # softmax는 단조 증가 함수라 argmax는 logits에서 바로 구해도 동일 (GPU에서 계산 후 복사)
+        preds = outputs['logits'].argmax(dim=-1).cpu().numpy()
+        probs = F.softmax(outputs['logits'], dim=-1).cpu()      # 제출용 확률값은 그대로 유지
 
         return preds, probs.tolist()
 
@@ -250,7 +279,11 @@ class Model(pl.LightningModule):
         if self.CFG['train']['optim'] == 'SGD':
             optimizer = self.optim(self.parameters(), lr=self.CFG['train']['LR']['lr'], momentum=0.9,weight_decay=1e-7)
         else:
-            optimizer = self.optim(self.parameters(), lr=self.CFG['train']['LR']['lr'])
+            optim_kwargs = {'lr': self.CFG['train']['LR']['lr']}
+            # Adam 계열은 fused CUDA 구현을 사용해 파라미터 텐서마다 커널을 띄우는 대신 한 번에 업데이트
+            if self.CFG['train']['optim'] in ('Adam', 'AdamW') and torch.cuda.is_available():
+                optim_kwargs['fused'] = True
+            optimizer = self.optim(self.parameters(), **optim_kwargs)
 
         if self.CFG['train']['LR']['name'] == 'LambdaLR':
             scheduler = torch.optim.lr_scheduler.LambdaLR(
@@ -1,10 +1,17 @@
+import ast
+import functools
+import hashlib
+import os
 import re
 import pickle
 import torch
 import yaml
+import numpy as np
 import pandas as pd
 import pytorch_lightning as pl
 
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
 from sklearn.model_selection import train_test_split
 from torch.utils.data import Dataset, DataLoader
 from transformers import DataCollatorForLanguageModeling
@@ -21,50 +28,58 @@ class Dataset(Dataset):
     Dataloader에서 불러온 데이터를 Dataset으로 만들기
     """
 
-    def __init__(self, inputs, targets=[], sub_obj_types=[], no_valid = False):
-        self.inputs = inputs
-        self.targets = targets
+    def __init__(self, inputs, targets=None, sub_obj_types=[], no_valid = False):
+        # padding 없이 토크나이징된 가변 길이 샘플을 dict of tensor 리스트로 한 번만 변환해두기
+        # (batch 단위 padding은 Dataloader.collate_fn에서 수행)
+        if inputs is None:      # no_valid용 더미 Dataset은 inputs가 없음
+            self.inputs = []
+        else:
+            keys = list(inputs.keys())
+            self.inputs = [{key: torch.tensor(inputs[key][i]) for key in keys}
+                           for i in range(len(inputs[keys[0]]))]
+        # 텐서에 대한 truthiness 검사는 에러가 나므로 sentinel은 None으로 통일
+        self.targets = None if targets is None or len(targets) == 0 \
+            else torch.as_tensor(targets, dtype=torch.long)
         self.sub_obj_types = sub_obj_types
         self.no_valid = no_valid
 
     def __getitem__(self, idx):
         if self.no_valid:
             return [], [], []
-        
-        inputs = {key: val[idx].clone().detach()
-                  for key, val in self.inputs.items()}
 
-        if self.targets:
-            targets = torch.tensor(self.targets[idx])
+        # 읽기만 하므로 clone 없이 인덱싱만 수행 (worker당 불필요한 할당 제거)
+        inputs = self.inputs[idx]
+
+        if self.targets is not None:
+            targets = self.targets[idx]
             sub_obj_types = tuple(self.sub_obj_types.iloc[idx])
-            
+
             return inputs, targets, sub_obj_types
         else:
             return inputs
-        
+
     def __len__(self):
         if self.no_valid:
             return 1
-        
-        return len(self.inputs['input_ids'])
+
+        return len(self.inputs)
         
 class ADVSDataset(Dataset):
     """
     Dataloader에서 불러온 데이터를 Dataset으로 만들기
     """
 
-    def __init__(self, inputs, targets=[]):
+    def __init__(self, inputs, targets=None):
         self.inputs = inputs
-        self.targets = targets
+        self.targets = None if targets is None or len(targets) == 0 \
+            else torch.as_tensor(targets, dtype=torch.long)
 
     def __getitem__(self, idx):
         inputs = {key: val[idx].clone().detach()
                   for key, val in self.inputs.items()}
 
-        if self.targets:
-            targets = torch.tensor(self.targets[idx])
-            
-            return inputs, targets
+        if self.targets is not None:
+            return inputs, self.targets[idx]
         else:
             return inputs
 
@@ -87,6 +102,43 @@ class TAPTDataset(Dataset):
     def __len__(self):
         return len(self.inputs['input_ids'])
 
+class LengthBucketSampler(torch.utils.data.Sampler):
+    """
+    길이가 비슷한 샘플끼리 묶어 batch를 만들어주는 sampler
+
+    Note:   완전 무작위로 섞으면 batch 안의 가장 긴 문장이 padding 길이를 결정해
+            attention 연산(O(L^2))이 padding 토큰에 낭비됨. 전체 인덱스를 셔플한 뒤
+            bucket 구간 안에서만 길이순으로 정렬해 batch를 만들고, batch 순서를
+            다시 셔플해서 기존 shuffle 의미를 유지함
+    """
+
+    def __init__(self, lengths, batch_size, shuffle=True, bucket_size_multiplier=50):
+        self.lengths = np.asarray(lengths)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.bucket_size = batch_size * bucket_size_multiplier
+
+    def __iter__(self):
+        if self.shuffle:
+            indices = np.random.permutation(len(self.lengths))
+        else:
+            indices = np.arange(len(self.lengths))
+
+        batches = []
+        for start in range(0, len(indices), self.bucket_size):
+            bucket = indices[start:start + self.bucket_size]
+            bucket = bucket[np.argsort(self.lengths[bucket], kind='stable')]
+            batches.extend(bucket[i:i + self.batch_size] for i in range(0, len(bucket), self.batch_size))
+
+        if self.shuffle:
+            np.random.shuffle(batches)
+
+        return iter([batch.tolist() for batch in batches])
+
+    def __len__(self):
+        return (len(self.lengths) + self.batch_size - 1) // self.batch_size
+
+
 class Dataloader(pl.LightningDataModule):
     """
     원본 데이터를 불러와 전처리 후 Dataloader 만들어 Dataset에 넘겨 최종적으로 사용할 데이터셋 만들기
@@ -96,6 +148,8 @@ class Dataloader(pl.LightningDataModule):
         super(Dataloader, self).__init__()
         self.CFG = CFG
         self.tokenizer = tokenizer
+        # 순수 파이썬 tokenizer는 단일 스레드 BPE라 전처리를 지배하므로 Rust fast tokenizer만 허용
+        assert tokenizer.is_fast, "use_fast=True로 불러온 fast tokenizer를 사용해주세요."
         
         train_df, predict_x, val_df = load_data()
         self.valid_df = val_df
@@ -106,6 +160,7 @@ class Dataloader(pl.LightningDataModule):
         self.train_dataset = None
         self.val_dataset = None
         self.predict_dataset = None
+        self.train_lengths = None
 
     def tokenizing(self, x):
         """ 토크나이징 함수
@@ -118,7 +173,8 @@ class Dataloader(pl.LightningDataModule):
         x: pd.DataFrame
 
         Returns:
-        inputs: Dict({'input_ids', 'token_type_ids', 'attention_mask'}), 각 tensor(num_data, max_length)
+        inputs: Dict({'input_ids', 'token_type_ids', 'attention_mask'}), 각 길이가 다른 list(num_data)
+                padding은 batch 단위로 collate_fn에서 수행
         """
         concat_entity = []
         for sub_ent, obj_ent in zip(x['subject_entity'], x['object_entity']):
@@ -127,8 +183,7 @@ class Dataloader(pl.LightningDataModule):
         inputs = self.tokenizer(
             concat_entity,
             list(x['sentence']),
-            return_tensors='pt',
-            padding=True,
+            padding=False,
             truncation=True,
             max_length=self.CFG['train']['token_max_len'],
             add_special_tokens=True,
@@ -146,12 +201,12 @@ class Dataloader(pl.LightningDataModule):
         x: pd.DataFrame
 
         Returns:
-        inputs: Dict({'input_ids', 'token_type_ids', 'attention_mask'}), 각 tensor(num_data, max_length)
+        inputs: Dict({'input_ids', 'token_type_ids', 'attention_mask'}), 각 길이가 다른 list(num_data)
+                padding은 batch 단위로 collate_fn에서 수행
         """
         inputs = self.tokenizer(
             list(x['sentence']),
-            return_tensors='pt',
-            padding=True,
+            padding=False,
             truncation=True,
             max_length=self.CFG['train']['token_max_len'],
             add_special_tokens=True,
@@ -159,12 +214,27 @@ class Dataloader(pl.LightningDataModule):
 
         return inputs
 
+    def encode_labels(self, y):
+        """
+        label 문자열 Series를 번호 텐서로 인코딩하기
+
+        Note:   원소별 dict 조회 listcomp 대신 pandas의 .map(dict)으로 C 레벨에서 변환하고,
+                텐서도 여기서 한 번만 생성해 Dataset에 그대로 넘김
+
+        Arguments:
+        y: pd.Series, label 문자열
+
+        Returns:
+        tensor(num_data, ), torch.long
+        """
+        return torch.from_numpy(y.map(self.label2num).to_numpy(np.int64))
+
     def preprocessing(self, x, train=False):
         DC = DataCleaning(self.CFG['select_DC'])
         DA = DataAugmentation(self.CFG['select_DA'])
         # 선택한 토크나이징 방법에 따라 동적으로 작동
-        tokenizing_method_name = 'self.short_tokenizing' if self.CFG['option']['short_tokenizing'] else 'self.tokenizing'
-        tokenizing_method = eval(tokenizing_method_name)
+        tokenizing_method_name = 'short_tokenizing' if self.CFG['option']['short_tokenizing'] else 'tokenizing'
+        tokenizing_method = getattr(self, tokenizing_method_name)
 
         if train:
             x = DC.process(x, train=True)
@@ -175,8 +245,8 @@ class Dataloader(pl.LightningDataModule):
                 train_y = x['label']
                 
                 train_inputs = tokenizing_method(train_x)
-                train_targets = [self.label2num[label] for label in train_y]
-                
+                train_targets = self.encode_labels(train_y)
+
                 return (train_inputs, train_targets, train_x[['subject_type', 'object_type']]), (None, None, None)
                 
                 
@@ -233,10 +303,10 @@ class Dataloader(pl.LightningDataModule):
                 val_y = valid_df['label']
             
             train_inputs = tokenizing_method(train_x)
-            train_targets = [self.label2num[label] for label in train_y]
+            train_targets = self.encode_labels(train_y)
 
             val_inputs = tokenizing_method(val_x)
-            val_targets = [self.label2num[label] for label in val_y]      # ([sub_types], [obj_types])
+            val_targets = self.encode_labels(val_y)
 
             return (train_inputs, train_targets, train_x[['subject_type', 'object_type']]), (val_inputs, val_targets, val_x[['subject_type', 'object_type']])
         else:
@@ -247,26 +317,121 @@ class Dataloader(pl.LightningDataModule):
         
             return test_inputs
 
+    def cache_path(self, stage):
+        """
+        토크나이징 캐시 파일 경로 만들기
+
+        Note:   같은 설정으로 실험을 반복할 때 cleaning/augmentation/토크나이징을 매번
+                다시 하지 않도록, 결과에 영향을 주는 설정값과 CSV 수정 시각을 키로 사용
+        """
+        csv_list = ['./dataset/new_train.csv', './dataset/new_test.csv']
+        key_source = repr((stage,
+                           self.tokenizer.name_or_path,
+                           self.CFG['seed'],
+                           self.CFG['select_DC'],
+                           self.CFG['select_DA'],
+                           self.CFG['option']['short_tokenizing'],
+                           {key: self.CFG['train'][key] for key in
+                            ['token_max_len', 'test_size', 'shuffle', 'no_valid',
+                             'adverse_valid', 'valid_split_beforehand']},
+                           [os.path.getmtime(path) for path in csv_list if os.path.exists(path)]))
+        key = hashlib.md5(key_source.encode()).hexdigest()
+
+        return f"./cache/tokenized_{key}.pt"
+
+    def save_cache(self, path, payload):
+        os.makedirs('./cache', exist_ok=True)
+        torch.save(payload, path)
+
     def setup(self, stage='fit'):
+        # 동일한 키의 캐시가 있으면 전처리/토크나이징을 건너뛰고 디스크에서 바로 읽기
+        path = self.cache_path(stage)
+        cached = torch.load(path, map_location='cpu') if os.path.exists(path) else None
+
         if stage == 'fit':
             # 학습 데이터 준비
-            train, val = self.preprocessing(self.train_df, train=True)
-            
+            if cached is not None:
+                train, val = cached['train'], cached['val']
+            else:
+                train, val = self.preprocessing(self.train_df, train=True)
+                # BatchEncoding의 Rust 객체는 pickle이 안 되므로 plain dict로 바꿔서 저장
+                self.save_cache(path, {
+                    'train': (dict(train[0]), train[1], train[2]),
+                    'val': (dict(val[0]) if val[0] is not None else None, val[1], val[2]),
+                })
+
             self.train_dataset = Dataset(train[0], train[1], train[2])
             self.val_dataset = Dataset(val[0], val[1], val[2], no_valid = self.CFG['train']['no_valid'])
+            # 길이 bucketing용으로 train 샘플별 토큰 길이 기록 (padding 전이라 실제 길이)
+            self.train_lengths = [len(input_ids) for input_ids in train[0]['input_ids']]
         else:
             # 평가 데이터 호출
-            predict_inputs = self.preprocessing(self.predict_x.copy())
+            if cached is not None:
+                predict_inputs = cached['predict']
+            else:
+                predict_inputs = self.preprocessing(self.predict_x.copy())
+                self.save_cache(path, {'predict': dict(predict_inputs)})
+
             self.predict_dataset = Dataset(predict_inputs)
 
+    def pad_inputs(self, inputs):
+        """
+        가변 길이 샘플들을 batch 내 최대 길이에 맞춰 padding해 쌓기
+        """
+        pad_values = {'input_ids': self.tokenizer.pad_token_id, 'attention_mask': 0, 'token_type_ids': 0}
+
+        return {key: torch.nn.utils.rnn.pad_sequence([item[key] for item in inputs],
+                                                     batch_first=True,
+                                                     padding_value=pad_values.get(key, 0))
+                for key in inputs[0]}
+
+    def collate_fn(self, batch):
+        """
+        batch 단위 동적 padding collate 함수
+
+        Note:   split 전체를 가장 긴 문장 기준으로 padding하면 짧은 batch에서도 padding 토큰에
+                연산을 낭비하게 되므로, 각 batch의 최대 길이까지만 padding함
+        """
+        if isinstance(batch[0], dict):          # predict 단계: inputs만 존재
+            return self.pad_inputs(batch)
+
+        if not isinstance(batch[0][0], dict):   # no_valid용 더미 배치는 그대로 통과
+            return batch[0]
+
+        inputs, targets, sub_obj_types = zip(*batch)
+        x = self.pad_inputs(inputs)
+        y = torch.stack(targets)
+        # 기존 default_collate와 동일하게 [(sub_type들), (obj_type들)] 형태로 전치
+        types = [tuple(t[0] for t in sub_obj_types), tuple(t[1] for t in sub_obj_types)]
+
+        return x, y, types
+
+    def loader_settings(self):
+        """
+        세 DataLoader가 공유하는 설정 만들기
+        worker를 여러 개 띄우고 pin_memory로 host→device 복사를 GPU 연산과 겹치게 하기
+        """
+        num_workers = self.CFG['train'].get('num_workers', 4)
+        settings = {'num_workers': num_workers, 'pin_memory': True, 'collate_fn': self.collate_fn}
+        if num_workers > 0:
+            settings['persistent_workers'] = True   # epoch마다 worker 재생성 방지
+            settings['prefetch_factor'] = 2         # 너무 크게 잡으면 OOM 위험
+
+        return settings
+
     def train_dataloader(self):
-        return DataLoader(self.train_dataset, batch_size=self.CFG['train']['batch_size'], shuffle=self.CFG['train']['shuffle'])
-    
+        # 길이가 비슷한 문장끼리 batch를 구성해 step당 padding 토큰 수 최소화
+        batch_sampler = LengthBucketSampler(self.train_lengths,
+                                            self.CFG['train']['batch_size'],
+                                            shuffle=self.CFG['train']['shuffle'])
+
+        return DataLoader(self.train_dataset, batch_sampler=batch_sampler, **self.loader_settings())
+
     def val_dataloader(self):
-        return DataLoader(self.val_dataset, batch_size=self.CFG['train']['batch_size'], shuffle=self.CFG['train']['shuffle'])
+        return DataLoader(self.val_dataset, batch_size=self.CFG['train']['batch_size'], shuffle=self.CFG['train']['shuffle'], **self.loader_settings())
 
     def predict_dataloader(self):
-        return DataLoader(self.predict_dataset, batch_size=self.CFG['train']['batch_size'])
+        return DataLoader(self.predict_dataset, batch_size=self.CFG['train']['batch_size'], **self.loader_settings())
     
 class ADVSDataloader(pl.LightningDataModule):
     """
@@ -403,6 +568,29 @@ class TAPTDataloader(pl.LightningDataModule):
     tokenizer = self.tokenizer, mlm=True, mlm_probability=0.15))
 
 
+# add_others_tokens에서 쓰는 일본어/한자 매칭 패턴 (모듈 로드 시 한 번만 컴파일)
+_OTH_RE = re.compile(r'[ぁ-ゔァ-ヴー々〆〤一-龥]+')
+
+# stop_words 멀티프로세싱 worker의 전역 상태 (프로세스마다 JVM 기반 Okt를 한 번만 띄우기 위함)
+_okt = None
+_stop_words = None
+
+
+def _strip_stopwords(sentence):
+    """
+    Pool worker: 형태소 분석 후 불용어를 제거한 문장 돌려주기
+    """
+    global _okt, _stop_words
+    if _okt is None:
+        _okt = Okt()
+        _stop_words = set()
+        with open('./utils/stop_word.txt', 'r') as f:
+            for line in f.readlines():
+                _stop_words.add(line.strip())
+
+    return " ".join(word for word in _okt.morphs(sentence) if word not in _stop_words)
+
+
 class DataCleaning():
     """
     config select DC에 명시된 Data Cleaning 기법을 적용시켜주는 클래스
@@ -410,13 +598,13 @@ class DataCleaning():
     def __init__(self, select_list):
         self.select_list = select_list
         self.continue_list = ['remove_duplicated']
+        # eval로 매번 이름을 파싱하는 대신 여기서 한 번만 검증하고 bound method를 캐싱
+        self.methods = [(name, getattr(self, name)) for name in (select_list or [])]
 
     def process(self, df, train=False):
-        if self.select_list:
-            for method_name in self.select_list:
-                if not train and method_name in self.continue_list: continue
-                method = eval("self." + method_name)
-                df = method(df)
+        for method_name, method in self.methods:
+            if not train and method_name in self.continue_list: continue
+            df = method(df)
 
         return df
 
@@ -439,21 +627,14 @@ class DataCleaning():
         for type_entity in ['subject', 'object']:
             column = f"{type_entity}_entity"
 
-            word_list, type_list = [], []
-            start_idx_list, end_idx_list = [], []
+            # 행마다 eval을 부르는 대신 ast.literal_eval을 .map으로 한 번에 적용하고
+            # json_normalize로 word/start_idx/end_idx/type 컬럼을 한꺼번에 뽑아내기
+            parsed = pd.json_normalize(df[column].map(ast.literal_eval))
 
-            for i in range(len(df)):
-                dictionary = eval(df.iloc[i][column])
-
-                word_list.append(dictionary['word'])
-                start_idx_list.append(dictionary['start_idx'])
-                end_idx_list.append(dictionary['end_idx'])
-                type_list.append(dictionary['type'])
-
-            df[column] = word_list
+            df[column] = parsed['word'].values
             for key in ['start_idx', 'end_idx', 'type']:
-                df[f"{type_entity}_{key}"] = eval(f"{key}_list")
-        
+                df[f"{type_entity}_{key}"] = parsed[key].values
+
         return df
     
     def normalize_class(self, df):
@@ -522,13 +703,18 @@ class DataCleaning():
         """
         pattern = re.compile(r'[ぁ-ゔ]+|[ァ-ヴー]+[々〆〤]')
         language = 'jpn'
-        for i in range(len(df)):
-            if pattern.search(df.loc[i,'sentence']):
-                df.loc[i, 'sentence'] = hangulize(df.loc[i, 'sentence'], language)
-            if pattern.search(df.loc[i,'subject_entity']):
-                df.loc[i, 'subject_entity'] = hangulize(df.loc[i, 'subject_entity'], language)
-            if pattern.search(df.loc[i,'object_entity']):
-                df.loc[i, 'object_entity'] = hangulize(df.loc[i, 'object_entity'], language)
+
+        # 같은 일본어 표기가 여러 행에서 반복되므로 변환 결과를 캐싱
+        @functools.lru_cache(maxsize=100_000)
+        def to_hangul(text):
+            return hangulize(text, language)
+
+        # 행마다 search/loc을 반복하는 대신, 일본어가 들어있는 행만 마스크로 걸러 한 번에 변환
+        # (대부분의 행은 매칭되지 않으므로 hangulize 호출 자체를 건너뜀)
+        for column in ['sentence', 'subject_entity', 'object_entity']:
+            mask = df[column].str.contains(pattern)
+            df.loc[mask, column] = df.loc[mask, column].map(to_hangul)
+
         return df
     
     def remove_duplicated(self, df):
@@ -549,17 +735,15 @@ class DataCleaning():
         sentence에서 entity 앞뒤로 [ENT] [/ENT] 태그 달아줘 entity임을 명시하기
         """
         # ENT 태크 달아주기
-        new_sentence = []
-        for _, row in df.iterrows():
-            sentence = row["sentence"]
+        # iterrows 대신 인덱스 컬럼을 ndarray로 한 번 뽑고, 문장마다 5조각으로 잘라 join 한 번으로 끝내기
+        idx_columns = df[['subject_start_idx', 'subject_end_idx', 'object_start_idx', 'object_end_idx']].to_numpy()
 
-            for check, idx in enumerate(sorted([row['subject_start_idx'], row['subject_end_idx'], row['object_start_idx'], row['object_end_idx']], reverse=True)):
-                if check % 2 == 0:
-                    sentence = sentence[:idx+1] + " [/ENT] " + sentence[idx+1:]
-                else:
-                    sentence = sentence[:idx] + "[ENT] " + sentence[idx:]
-            
-            new_sentence.append(sentence)
+        new_sentence = []
+        for sentence, idxs in zip(df['sentence'], idx_columns):
+            i0, i1, i2, i3 = sorted(idxs, reverse=True)
+            new_sentence.append(''.join([sentence[:i3], "[ENT] ", sentence[i3:i2+1], " [/ENT] ",
+                                         sentence[i2+1:i1], "[ENT] ", sentence[i1:i0+1], " [/ENT] ",
+                                         sentence[i0+1:]]))
         df['sentence'] = new_sentence
 
         return df
@@ -569,24 +753,21 @@ class DataCleaning():
         sentence에서 entity 앞뒤로 [{S|O}:{type}] 태그 달아줘 entity임을 상세하게 명시하기
         """
         # [{S|O}:{type}] 태크 달아주기
+        idx_columns = df[['subject_start_idx', 'subject_end_idx', 'object_start_idx', 'object_end_idx']].to_numpy()
+
         new_sentence = []
-        for _, row in df.iterrows():
-            sentence = row["sentence"]
-            trigger = True if row['object_end_idx'] > row['subject_end_idx'] else False
+        for sentence, idxs, sub_type, obj_type in zip(df['sentence'], idx_columns, df['subject_type'], df['object_type']):
+            i0, i1, i2, i3 = sorted(idxs, reverse=True)
 
-            for check, idx in enumerate(sorted([row['subject_start_idx'], row['subject_end_idx'], row['object_start_idx'], row['object_end_idx']], reverse=True)):
-                if trigger:
-                    token = f"O:{row['object_type']}"
-                else:
-                    token = f"S:{row['subject_type']}"
+            # 문장 뒤쪽에 오는 entity가 object면 O 태그, 앞쪽이 S 태그 (기존 trigger 로직과 동일)
+            if idxs[3] > idxs[1]:   # object_end_idx > subject_end_idx
+                first_token, last_token = f"S:{sub_type}", f"O:{obj_type}"
+            else:
+                first_token, last_token = f"O:{obj_type}", f"S:{sub_type}"
 
-                if check % 2 == 0:
-                    sentence = sentence[:idx+1] + f" [/{token}] " + sentence[idx+1:]
-                else:
-                    sentence = sentence[:idx] + f"[{token}] " + sentence[idx:]
-                    trigger = not trigger
-            
-            new_sentence.append(sentence)
+            new_sentence.append(''.join([sentence[:i3], f"[{first_token}] ", sentence[i3:i2+1], f" [/{first_token}] ",
+                                         sentence[i2+1:i1], f"[{last_token}] ", sentence[i1:i0+1], f" [/{last_token}] ",
+                                         sentence[i0+1:]]))
         df['sentence'] = new_sentence
 
         return df
@@ -676,41 +857,37 @@ class DataCleaning():
         """
         sentence에서 일본어와 한자를 [OTH] 토큰으로 바꾸기
         """
-        df['sentence'].replace(r'[ぁ-ゔァ-ヴー々〆〤一-龥]+', '[OTH]', regex=True, inplace=True)
+        df['sentence'] = df['sentence'].str.replace(_OTH_RE, '[OTH]', regex=True)
 
         return df
 
     def stop_words(self, df):
         """
         정적 데이터로 만들어진 불용어 리스트를 기반으로 입력 데이터의 불용어 제거하기
+
+        Okt 형태소 분석은 호출당 지연이 큰 JVM 작업이라 행 단위로 직렬 실행하면 병목이 됨
+        행끼리는 독립적이므로 프로세스 풀로 나눠서 병렬 처리하기
         """
-        # 불용어 리스트
-        okt = Okt()
-        stop_words = set()
-        with open('./utils/stop_word.txt', 'r') as f:
-            for line in f.readlines():
-                stop_words.add(line.strip())
-
-        # 불용어 제거 후 새로운 문장 만들기
-        def logic(x):
-            new_sentence = []
-            for word in okt.morphs(x):
-                if word not in stop_words:
-                    new_sentence.append(word)
-            
-            return " ".join(new_sentence)
-            
-        df['sentence'] = df['sentence'].apply(lambda x: logic(x))
+        with Pool(os.cpu_count()) as p:
+            df['sentence'] = list(p.imap(_strip_stopwords, df['sentence'], chunksize=256))
 
         return df
     
     def spacing(self, df):
         """
         띄어쓰기 문법 교정
+
+        Note:   PyKoSpacing은 문장 하나(str)만 받는 API라 리스트 배치 호출이 불가능함.
+                대신 내부 keras predict가 GIL을 풀어주므로 스레드 풀로 문장별 호출을
+                겹쳐서 직렬 .apply보다 빠르게 처리함
         """
         lib = Spacing()
 
-        df['sentence'] = df['sentence'].apply(lambda x: lib(x.replace(" ", "")))
+        sentences = df['sentence'].str.replace(' ', '', regex=False).tolist()
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            df['sentence'] = list(executor.map(lib, sentences))
+
+        return df
 
     def entity_mask_base(self, df):
         """
@@ -731,13 +908,22 @@ class DataCleaning():
         Return:
         df: subject_entity와 object_entity에 마스킹 처리 작업이 완료된 DataFrame
         """
-        for idx, row in df.iterrows():
-            words=re.findall('\[ENT].+?\[/ENT]',row['sentence'])
-            if row['subject_start_idx']<row['object_start_idx']:
-                df.loc[idx,'sentence']=row['sentence'].replace(words[0],'[SUB]').replace(words[1],'[OBJ]')
+        # iterrows + df.loc 행 단위 쓰기는 매번 index 정렬 비용이 들므로,
+        # 필요한 컬럼을 ndarray로 한 번 꺼내 리스트로 만들고 마지막에 한 번만 대입
+        ent_pattern = re.compile(r'\[ENT].+?\[/ENT]')
+        sentences = df['sentence'].to_numpy()
+        sub_starts = df['subject_start_idx'].to_numpy()
+        obj_starts = df['object_start_idx'].to_numpy()
+
+        new_sentence = []
+        for sentence, sub_start, obj_start in zip(sentences, sub_starts, obj_starts):
+            words = ent_pattern.findall(sentence)
+            if sub_start < obj_start:
+                new_sentence.append(sentence.replace(words[0], '[SUB]').replace(words[1], '[OBJ]'))
             else:
-                df.loc[idx,'sentence']=row['sentence'].replace(words[0],'[OBJ]').replace(words[1],'[SUB]')
-        
+                new_sentence.append(sentence.replace(words[0], '[OBJ]').replace(words[1], '[SUB]'))
+        df['sentence'] = new_sentence
+
         df['subject_entity']='[SUB]'
         df['object_entity']='[OBJ]'
 
@@ -851,16 +1037,15 @@ class DataAugmentation():
 
     def __init__(self, select_list):
         self.select_list = select_list
+        # DataCleaning과 동일하게 기법 이름 검증과 메소드 조회는 여기서 한 번만 수행
+        self.methods = [getattr(self, name) for name in (select_list or [])]
 
     def process(self, df):
-        if self.select_list:
-            aug_df = pd.DataFrame(columns=df.columns)
-
-            for method_name in self.select_list:
-                method = eval("self." + method_name)
-                aug_df = pd.concat([aug_df, method(df)])
-
-            df = pd.concat([df, aug_df])
+        if self.methods:
+            # 루프 안에서 concat을 반복하면 매번 전체 frame을 재할당하므로(O(N^2)),
+            # 증강 결과를 리스트에 모았다가 마지막에 한 번만 concat
+            aug_frames = [method(df) for method in self.methods]
+            df = pd.concat([df, *aug_frames], ignore_index=True, copy=False)
 
         return df
     
@@ -973,15 +1158,35 @@ class DataAugmentation():
         return aug_df
 
 
+def read_csv_fast(path):
+    """
+    CSV를 pyarrow 엔진으로 읽어오기
+
+    Note:   pyarrow 파서는 C++ 멀티스레드라 기본 C 엔진보다 큰 CSV에서 수 배 빠름
+            (pandas/pyarrow 버전이 지원하지 않는 환경이면 기본 엔진으로 fallback)
+            값 종류가 적은 컬럼은 category로 캐스팅해 메모리와 .map 비용 절약
+    """
+    try:
+        df = pd.read_csv(path, engine='pyarrow')
+    except (ImportError, ValueError, TypeError):
+        df = pd.read_csv(path)
+
+    for column in ['label', 'source', 'subject_type', 'object_type']:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+
+    return df
+
+
 def load_data():
     """
     학습 데이터와 테스트 데이터 DataFrame 가져오기
     """
     with open('./use_config.yaml') as f:
         CFG = yaml.load(f, Loader=yaml.FullLoader)
-        
-    train_df = pd.read_csv('./dataset/new_train.csv')
-    test_x = pd.read_csv('./dataset/new_test.csv')
+
+    train_df = read_csv_fast('./dataset/new_train.csv')
+    test_x = read_csv_fast('./dataset/new_test.csv')
     # train_df.drop(['id', 'source'], axis=1, inplace=True)
     # test_x.drop(['id', 'source'], axis=1, inplace=True)
     val_df = None
@@ -60,21 +60,22 @@ def klue_re_auprc(probs, labels, num_labels):
     return np.average(score) * 100.0  # 배치 전체에 대해 계산했던 걸 다시 전체 평균
 
 
-def compute_metrics(outputs, y):
+def compute_metrics(outputs, y, preds=None):
     """ validation을 위한 metrics function
     Note:
 
     Arguments:
     outputs: 모델 output['logits']값으로부터 softmax가 취해진 값. (batch, num_label)
     y: 정답 값. (batch, )
+    preds: 미리 argmax된 예측값. (batch, ), 없으면 outputs에서 계산
 
     Return:
     Dict({'micro f1 score', 'auprc', 'accuracy'})
     """
 
     labels = y.cpu().detach().numpy()
-    preds = outputs.cpu().detach().numpy().argmax(-1)
     probs = outputs.cpu().detach().numpy()   # (batch, num_labels)
+    preds = probs.argmax(-1) if preds is None else preds.cpu().detach().numpy()
     num_labels = outputs.size(-1)            # num_labels
 
     # calculate accuracy using sklearn's function